@@ -1,19 +1,133 @@
 import os
 import time
+import json
+import atexit
+import functools
+from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Tuple, Callable, Any, Optional
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from crewai import Agent, Task, Crew, Process
+import openai
 from amadeus import Client, ResponseError
 
+from keep_alive import KeepAliveOpener
+
+logger = logging.getLogger(__name__)
+
 # Amadeus client - uses AMADEUS_CLIENT_ID / SECRET from system env vars
-amadeus = Client()
+amadeus = Client(http=KeepAliveOpener(timeout=30.0))
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() only blocks once the bucket is empty."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate              # tokens added per second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Shared limiter for all Amadeus calls (self-service quota is 10 TPS, stay a bit below it)
+_rate_limiter = TokenBucket(rate=8, capacity=8)
+
+# Statuses worth retrying; anything else (e.g. 400 bad request) fails immediately
+_TRANSIENT_STATUSES = {429, 500, 502, 503}
+
+def amadeus_call(fallback_factory: Callable[..., Any] = lambda *args: None, attempts: int = 3):
+    """
+    Wraps a function that makes one Amadeus request: takes a rate-limiter token before each
+    attempt, retries transient errors (429/5xx) with exponential backoff, and logs and
+    returns fallback_factory(*args) once the call has failed for good.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            for attempt in range(attempts):
+                _rate_limiter.acquire()
+                try:
+                    return func(*args)
+                except ResponseError as error:
+                    status = getattr(error.response, "status_code", None)
+                    if status in _TRANSIENT_STATUSES and attempt < attempts - 1:
+                        logger.info("[%s] Amadeus returned %s, retrying", func.__name__, status)
+                        time.sleep(0.5 * 2 ** attempt)
+                        continue
+                    logger.error("[%s] Amadeus API error: %s", func.__name__, error)
+                except Exception as error:
+                    logger.error("[%s] General error: %s", func.__name__, error)
+                return fallback_factory(*args)
+        return wrapper
+    return decorator
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that lets a 64 KB buffer batch writes instead of flushing after every record.
+
+    Records at flush_level or above are written out straight away (like MemoryHandler's
+    flushLevel), so the errors leading up to a crash still reach the file.
+    """
+
+    def __init__(self, *args, flush_level=logging.ERROR, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flush_level = flush_level
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536, encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= self.flush_level:
+            super().flush()
+
+    def flush(self):
+        # Otherwise the buffer is written out when it fills up and when the handler is closed
+        pass
+
+# Level for the final itinerary: timestamped in the log file, printed without a prefix on the console
+RESULT = 25
+logging.addLevelName(RESULT, "RESULT")
+
+class ConsoleFormatter(logging.Formatter):
+    """Formatter that prints RESULT records as the bare message."""
+
+    def format(self, record):
+        if record.levelno == RESULT:
+            return record.getMessage()
+        return super().format(record)
+
+_log_listener: logging.handlers.QueueListener | None = None
+
+def _stop_log_listener():
+    """Drains queued file records at exit."""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+# Registered at import, before any other atexit handler in this module, so it runs last
+# (atexit is LIFO) and still writes records logged by the others, e.g. the cache save
+atexit.register(_stop_log_listener)
 
 def setup_logging():
-    """Configures logging to file and console."""
+    """Configures logging to console and file (the file is written by a background listener thread)."""
+    global _log_listener
     log_file = 'travel_log.log'
     
     # 1. Get the root logger
@@ -23,29 +137,37 @@ def setup_logging():
     # Prevent duplicate handlers if setup is called multiple times
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
+    if _log_listener is not None:
+        _log_listener.stop()
+        # Close the previous file handler so its buffered records are written out
+        for handler in _log_listener.handlers:
+            handler.close()
     
-    # Define the formatter
-    formatter = logging.Formatter(
-        fmt='%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    # Define the formatters
+    log_format = '%(asctime)s - %(levelname)s - %(message)s'
+    date_format = '%Y-%m-%d %H:%M:%S'
+    formatter = logging.Formatter(fmt=log_format, datefmt=date_format)
 
     # 2. File Handler (for log file)
-    file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+    file_handler = BufferedFileHandler(log_file, mode='a', encoding='utf-8')
     file_handler.setFormatter(formatter)
     
     # 3. Stream Handler (for console output)
     stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setFormatter(formatter)
+    stream_handler.setFormatter(ConsoleFormatter(fmt=log_format, datefmt=date_format))
 
-    # 4. Add handlers to the root logger
-    root_logger.addHandler(file_handler)
+    # 4. Console output stays synchronous so it keeps its order with print()/input();
+    #    file records go through a queue to a listener thread, drained by _stop_log_listener at exit
+    log_queue = queue.SimpleQueue()
     root_logger.addHandler(stream_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _log_listener.start()
     
     # Log a separator for clarity in the file
-    logging.info("="*50)
-    logging.info("NEW TRAVEL PLANNING SESSION STARTED")
-    logging.info("="*50)
+    logger.info("="*50)
+    logger.info("NEW TRAVEL PLANNING SESSION STARTED")
+    logger.info("="*50)
 
 
 # ---------- Simple domain models (non-LLM "tools") ----------
@@ -73,411 +195,586 @@ class UserTripRequest:
     destination: str
     departure_date: str
     return_date: str
+    destination_airport: str
 
 # ---------- City/Airport code lookup with caching ----------
-_code_cache: Dict[str, str] = {}
+# Airport and city codes are cached separately: "paris" is CDG as an airport but PAR as a city.
+# Both are keyed by the casefolded city name (see _name_key).
+_airport_code_cache: Dict[str, str] = {}
+_city_code_cache: Dict[str, str] = {}
 _coordinate_cache: Dict[str, tuple] = {} # Cache for (latitude, longitude)
+# Guards cache writes, since the lookups below may run on worker threads
+_cache_lock = threading.Lock()
+
+# ---------- Persistent cache (survives across CLI runs) ----------
+_CACHE_PATH = Path.home() / ".travel_planner_cache.json"
+_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60 # Entries older than 30 days are refetched
+# Section name in the cache file -> in-memory cache it mirrors
+_PERSISTED_CACHES: Dict[str, dict] = {
+    "airport_codes": _airport_code_cache,
+    "city_codes": _city_code_cache,
+    "coords": _coordinate_cache,
+}
+# Sections keyed by city name rather than IATA code; their keys are normalized on load
+_NAME_KEYED_SECTIONS = {"airport_codes", "city_codes"}
+# When each persisted entry was first fetched, so its age survives a round-trip to disk
+_cache_timestamps: Dict[str, Dict[str, float]] = {section: {} for section in _PERSISTED_CACHES}
+
+def _load_persistent_cache():
+    """Loads cached codes and coordinates from disk, skipping expired entries."""
+    if not _CACHE_PATH.exists():
+        return
+    try:
+        data = json.loads(_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as error:
+        logger.error("[cache] Could not read %s: %s", _CACHE_PATH, error)
+        return
+
+    if not isinstance(data, dict):
+        logger.error("[cache] Ignoring %s: unexpected layout", _CACHE_PATH)
+        return
+
+    cutoff = time.time() - _CACHE_TTL_SECONDS
+    for section, cache in _PERSISTED_CACHES.items():
+        entries = data.get(section)
+        if not isinstance(entries, dict):
+            continue
+        for key, entry in entries.items():
+            try:
+                ts = entry["ts"]
+                value = entry["value"]
+                if ts < cutoff:
+                    continue
+            except (AttributeError, KeyError, TypeError):
+                # Hand-edited or older layout (e.g. a bare value instead of {"value", "ts"}): refetch it
+                continue
+            if section in _NAME_KEYED_SECTIONS:
+                key = _name_key(key)
+            # JSON has no tuples; coordinates come back as lists
+            cache[key] = tuple(value) if isinstance(value, list) else value
+            _cache_timestamps[section][key] = ts
+
+def _save_persistent_cache():
+    """Writes the in-memory caches back to disk (registered with atexit)."""
+    now = time.time()
+    with _cache_lock:
+        data = {
+            section: {
+                key: {"value": value, "ts": _cache_timestamps[section].get(key, now)}
+                for key, value in cache.items()
+            }
+            for section, cache in _PERSISTED_CACHES.items()
+        }
+    try:
+        # Write to a temp file first so an interrupted run cannot leave a half-written cache
+        tmp_path = _CACHE_PATH.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        tmp_path.replace(_CACHE_PATH)
+    except OSError as error:
+        logger.error("[cache] Could not write %s: %s", _CACHE_PATH, error)
+
+def _name_key(city_name: str) -> str:
+    """Normalized cache key for a city name (Unicode-aware, case-insensitive)."""
+    return city_name.casefold()
+
+_load_persistent_cache()
+atexit.register(_save_persistent_cache)
+
+def _resolve_city(name_or_code: str) -> Tuple[str, tuple | None]:
+    """
+    Resolves a city name (or city code) to (city_code, (latitude, longitude)).
+    One FULL-view locations call fills both the code and coordinate caches;
+    coordinates are None if the lookup failed or returned no geoCode.
+    """
+    key = _name_key(name_or_code)
+    if key in _city_code_cache:
+        code = _city_code_cache[key]
+        return code, _coordinate_cache.get(code)
+    return _fetch_city(name_or_code)
+
+@amadeus_call(lambda name_or_code: (name_or_code[:3].upper(), None))
+def _fetch_city(name_or_code: str) -> Tuple[str, tuple | None]:
+    """Cache-miss path of _resolve_city: one locations call, stored in both caches."""
+    # Include 'view=FULL' to get coordinates for later use
+    response = amadeus.reference_data.locations.get(
+        keyword=name_or_code,
+        subType="CITY",
+        view="FULL", # Requesting FULL view to get coordinates
+    )
+    if not response.data:
+        logger.info("[_fetch_city] No city found for '%s'", name_or_code)
+        return name_or_code[:3].upper(), None
+
+    code = response.data[0]["iataCode"]
+
+    # Cache coordinates as well
+    geo = response.data[0].get("geoCode", {})
+    lat = geo.get("latitude")
+    lon = geo.get("longitude")
+    coordinates = (lat, lon) if lat and lon else None
+    with _cache_lock:
+        _city_code_cache[_name_key(name_or_code)] = code
+        if coordinates:
+            _coordinate_cache[code] = coordinates
+
+    return code, coordinates
 
 def get_city_code(city_name: str) -> str:
     """Convert city name to IATA city code with caching."""
-    if city_name.upper() in _code_cache:
-        return _code_cache[city_name.upper()]
-    
-    try:
-        time.sleep(0.5)
-        # Include 'view=FULL' to get coordinates for later use
-        response = amadeus.reference_data.locations.get(
-            keyword=city_name,
-            subType="CITY",
-            view="FULL", # Requesting FULL view to get coordinates
-        )
-        if response.data:
-            code = response.data[0]["iataCode"]
-            _code_cache[city_name.upper()] = code
-
-            # Cache coordinates as well
-            geo = response.data[0].get("geoCode", {})
-            lat = geo.get("latitude")
-            lon = geo.get("longitude")
-            if lat and lon:
-                _coordinate_cache[code] = (lat, lon)
-
-            return code
-        else:
-            logging.info(f"[get_city_code] No city found for '{city_name}'")
-            return city_name[:3].upper()
-    except Exception as error:
-        logging.error(f"[get_city_code] Error for '{city_name}': {error}")
-        return city_name[:3].upper()
+    return _resolve_city(city_name)[0]
 
 def get_airport_code(city_name: str) -> str:
     """Convert city name to primary airport code."""
-    if city_name.upper() in _code_cache:
-        return _code_cache[city_name.upper()]
-    
-    try:
-        time.sleep(0.5)
-        # FIX: Removed the unsupported 'max=1' parameter
-        response = amadeus.reference_data.locations.get(
-            keyword=city_name,
-            subType="AIRPORT",
-        )
-        if response.data:
-            code = response.data[0]["iataCode"]
-            _code_cache[city_name.upper()] = code
-            return code
-        else:
-            logging.info(f"[get_airport_code] No airport, using city code for '{city_name}'")
-            return get_city_code(city_name)
-    except Exception as error:
-        logging.error(f"[get_airport_code] Error for '{city_name}': {error}")
+    key = _name_key(city_name)
+    if key in _airport_code_cache:
+        return _airport_code_cache[key]
+    return _fetch_airport_code(city_name)
+
+@amadeus_call(lambda city_name: get_city_code(city_name))
+def _fetch_airport_code(city_name: str) -> str:
+    """Cache-miss path of get_airport_code; falls back to the city code."""
+    # FIX: Removed the unsupported 'max=1' parameter
+    response = amadeus.reference_data.locations.get(
+        keyword=city_name,
+        subType="AIRPORT",
+        view="LIGHT", # Only iataCode is used; the API defaults to the larger FULL view
+    )
+    if not response.data:
+        logger.info("[_fetch_airport_code] No airport, using city code for '%s'", city_name)
         return get_city_code(city_name)
-    
+
+    code = response.data[0]["iataCode"]
+    with _cache_lock:
+        _airport_code_cache[_name_key(city_name)] = code
+    return code
+
 def get_city_coordinates(city_code: str) -> tuple | None:
-    """Retrieves (latitude, longitude) for a cached city code."""
-    # Check if coordinates are already cached by the IATA code
+    """
+    Retrieves (latitude, longitude) for a city code. Cached coordinates are returned directly;
+    otherwise one _resolve_city lookup fills the cache. None only if that lookup failed.
+    """
     if city_code in _coordinate_cache:
         return _coordinate_cache[city_code]
-    
-    # If not cached, try to fetch the location data again
-    try:
-        time.sleep(0.5)
-        response = amadeus.reference_data.locations.get(
-            keyword=city_code,
-            subType="CITY",
-            view="FULL",
-        )
-        if response.data:
-            geo = response.data[0].get("geoCode", {})
-            lat = geo.get("latitude")
-            lon = geo.get("longitude")
-            if lat and lon:
-                _coordinate_cache[city_code] = (lat, lon)
-                return lat, lon
-        return None
-    except Exception as error:
-        logging.error(f"[get_city_coordinates] Error fetching coordinates for '{city_code}': {error}")
-        return None
+    return _resolve_city(city_code)[1]
 
 # ---------- Amadeus API calls ----------
-def find_best_flight(origin: str, destination: str, dep: str, ret: str) -> FlightOption:
-    """Real Amadeus Flight Offers Search API (requires airport codes)."""
+def ttl_cache(seconds: float = 600, cache_if: Callable[[Any], bool] = lambda result: result is not None):
+    """
+    Memoizes a function on its positional args for `seconds`.
+    Results rejected by `cache_if` (by default None, i.e. a failed lookup) are returned
+    but not stored, so a transient API failure is retried on the next call.
+    """
+    def decorator(func):
+        cache: Dict[tuple, tuple] = {} # args -> (result, expires_at)
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(args)
+            if hit and hit[1] > now:
+                return hit[0]
+
+            result = func(*args)
+            if cache_if(result):
+                with lock:
+                    cache[args] = (result, now + seconds)
+            return result
+        return wrapper
+    return decorator
+
+@ttl_cache(600)
+@amadeus_call()
+def find_best_flight(origin: str, destination: str, dep: str, ret: str) -> Optional[FlightOption]:
+    """Real Amadeus Flight Offers Search API (requires airport codes). Returns None if no flight was found."""
     # Replaced '→' with '->' to avoid the UnicodeEncodeError in console logging
-    logging.info(f"[find_best_flight] Searching {origin} (Airport) -> {destination} (Airport)")
-    try:
-        time.sleep(0.5)
-        response = amadeus.shopping.flight_offers_search.get(
-            originLocationCode=origin,
-            destinationLocationCode=destination,
-            departureDate=dep,
-            returnDate=ret,
-            adults=1,
-            currencyCode="USD",
-            max=3,
-        )
-        offers = response.data
-        if not offers:
-            return FlightOption(
-                airline="No flights found",
-                price="N/A",
-                departure_time="N/A",
-                arrival_time="N/A",
-            )
-
-        best = offers[0]
-        price = best["price"]["total"]
-        first_itinerary = best["itineraries"][0]
-        first_segment = first_itinerary["segments"][0]
-        last_segment = first_itinerary["segments"][-1]
-
-        airline = first_segment["carrierCode"]
-        departure_time = first_segment["departure"]["at"]
-        arrival_time = last_segment["arrival"]["at"]
-        
-        logging.info(f"[find_best_flight] Found flight with {airline} at {price} USD.")
+    logger.info("[find_best_flight] Searching %s (Airport) -> %s (Airport)", origin, destination)
+    response = amadeus.shopping.flight_offers_search.get(
+        originLocationCode=origin,
+        destinationLocationCode=destination,
+        departureDate=dep,
+        returnDate=ret,
+        adults=1,
+        currencyCode="USD",
+        max=3,
+    )
+    offers = response.data
+    if not offers:
+        logger.info("[find_best_flight] No flights found.")
+        return None
 
-        return FlightOption(
-            airline=airline,
-            price=f"{price} USD",
-            departure_time=departure_time,
-            arrival_time=arrival_time,
-        )
-    except ResponseError as error:
-        logging.error(f"[find_best_flight] Amadeus error: {error}")
-        return FlightOption(
-            airline="Error fetching flights",
-            price="N/A",
-            departure_time="N/A",
-            arrival_time="N/A",
-        )
+    best = offers[0]
+    price = best["price"]["total"]
+    first_itinerary = best["itineraries"][0]
+    first_segment = first_itinerary["segments"][0]
+    last_segment = first_itinerary["segments"][-1]
+
+    airline = first_segment["carrierCode"]
+    departure_time = first_segment["departure"]["at"]
+    arrival_time = last_segment["arrival"]["at"]
+    
+    logger.info("[find_best_flight] Found flight with %s at %s USD.", airline, price)
+
+    return FlightOption(
+        airline=airline,
+        price=f"{price} USD",
+        departure_time=departure_time,
+        arrival_time=arrival_time,
+    )
 
-def find_best_hotel(destination: str, dep: str, ret: str) -> HotelOption:
+@ttl_cache(3600)
+@amadeus_call()
+def find_best_hotel(destination: str, dep: str, ret: str) -> Optional[HotelOption]:
     """
-    Finds the best hotel offer by City Code. 
+    Finds the best hotel offer by City Code; returns None if no offer was found.
     (Revised to use amadeus.get() for direct endpoint access, bypassing the structured object that caused the 'no attribute' error.)
     """
-    logging.info(f"[find_best_hotel] Searching hotels in {destination} (City Code)")
+    logger.info("[find_best_hotel] Searching hotels in %s (City Code)", destination)
     
-    try:
-        # STEP 1: Get hotel offers directly by City Code (LON, PAR, NYC, etc.)
-        time.sleep(0.5)
-        # FIX: Use amadeus.get() with the V3 endpoint path to avoid the 'no attribute' error
-        response = amadeus.get(
-            '/v3/shopping/hotel-offers',
-            cityCode=destination,
-            checkInDate=dep,
-            checkOutDate=ret,
-            adults=1,
-            currency="USD",
-            view="FULL", # Request full details
-            bestRateOnly=True # Only get the best available rate
-        )
-        
-        # Check if the response contains data and offers
-        if not response.data or not response.data[0].get("offers"):
-            logging.info(f"[find_best_hotel] No offers found for hotels in {destination}.")
-            return HotelOption(
-                name="No hotel offers found",
-                nightly_price="N/A",
-                address="N/A",
-            )
-
-        # Extract the best offer from the first hotel returned
-        first_hotel_offers = response.data[0]
-        hotel_info = first_hotel_offers.get("hotel", {})
-        offer_info = first_hotel_offers.get("offers", [{}])[0]
-        
-        name = hotel_info.get("name", "Unknown Hotel")
-        address_lines = hotel_info.get("address", {}).get("lines", [])
-        address = address_lines[0] if address_lines else "Address not available"
-        price = offer_info.get("price", {}).get("total", "N/A")
+    # STEP 1: Get hotel offers directly by City Code (LON, PAR, NYC, etc.)
+    # FIX: Use amadeus.get() with the V3 endpoint path to avoid the 'no attribute' error
+    response = amadeus.get(
+        '/v3/shopping/hotel-offers',
+        cityCode=destination,
+        checkInDate=dep,
+        checkOutDate=ret,
+        adults=1,
+        currency="USD",
+        view="FULL", # Request full details (needed for the hotel address lines)
+        bestRateOnly=True # Only get the best available rate
+    )
+    
+    # Check if the response contains data and offers
+    if not response.data or not response.data[0].get("offers"):
+        logger.info("[find_best_hotel] No offers found for hotels in %s.", destination)
+        return None
 
-        logging.info(f"[find_best_hotel] Found offer for {name}")
-        
-        return HotelOption(
-            name=name,
-            nightly_price=f"{price} USD",
-            address=address,
-        )
-        
-    except ResponseError as error:
-        logging.error(f"[find_best_hotel] Amadeus API error: {error}")
-        return HotelOption(
-            name="Error fetching hotels (API issue)",
-            nightly_price="N/A",
-            address="N/A",
-        )
-    except Exception as error:
-        logging.error(f"[find_best_hotel] General error: {error}")
-        # This will now catch genuine API issues or data parsing issues
-        return HotelOption(
-            name="Error fetching hotels (General)",
-            nightly_price="N/A",
-            address="N/A",
-        )
+    # Extract the best offer from the first hotel returned
+    first_hotel_offers = response.data[0]
+    hotel_info = first_hotel_offers.get("hotel", {})
+    offer_info = first_hotel_offers.get("offers", [{}])[0]
+    
+    name = hotel_info.get("name", "Unknown Hotel")
+    address_lines = hotel_info.get("address", {}).get("lines", [])
+    address = address_lines[0] if address_lines else "Address not available"
+    price = offer_info.get("price", {}).get("total", "N/A")
 
+    logger.info("[find_best_hotel] Found offer for %s", name)
+    
+    return HotelOption(
+        name=name,
+        nightly_price=f"{price} USD",
+        address=address,
+    )
 
-def get_activities(destination: str) -> List[Activity]:
-    """Dynamically fetches activities using the Amadeus Activities API (requires coordinates)."""
+
+@ttl_cache(86400)
+def get_activities(destination: str) -> Optional[List[Activity]]:
+    """
+    Dynamically fetches activities using the Amadeus Activities API (requires coordinates).
+    Returns None if no activities could be found.
+    """
     
+    # Warm path: the CLI's city-code lookup normally cached the coordinates already.
+    # Otherwise (e.g. an IATA code that was never resolved) one FULL-view lookup fills both caches.
     coordinates = get_city_coordinates(destination)
     if not coordinates:
-        logging.info(f"[get_activities] Failed to get coordinates for city code {destination}.")
-        return [Activity("Coordinate Error", "Cannot search activities without coordinates.")]
+        logger.info("[get_activities] Failed to get coordinates for city code %s.", destination)
+        return None
 
     latitude, longitude = coordinates
-    logging.info(f"[get_activities] Searching activities near {destination} ({latitude}, {longitude})")
+    logger.info("[get_activities] Searching activities near %s (%s, %s)", destination, latitude, longitude)
+    return _search_activities(destination, latitude, longitude)
+
+@amadeus_call()
+def _search_activities(destination: str, latitude: float, longitude: float) -> Optional[List[Activity]]:
+    """Activities API call for get_activities; returns up to 3 activities or None."""
+    # Use Amadeus Activities API v1, which requires latitude and longitude
+    response = amadeus.shopping.activities.get(
+        latitude=latitude,
+        longitude=longitude,
+        radius=20, # Increased search radius for better results
+    )
 
-    try:
-        # Use Amadeus Activities API v1, which requires latitude and longitude
-        time.sleep(0.5)
-        response = amadeus.shopping.activities.get(
-            latitude=latitude,
-            longitude=longitude,
-            radius=20, # Increased search radius for better results
-        )
+    activities_list = []
+    # Get up to 3 activities
+    for item in response.data[:3]:
+        name = item.get("name", "Unknown Activity")
+        description = f"Category: {item.get('category', 'N/A')}"
         
-        activities_list = []
-        # Get up to 3 activities
-        for item in response.data[:3]:
-            name = item.get("name", "Unknown Activity")
-            description = f"Category: {item.get('category', 'N/A')}"
-            
-            # Use short description if available
-            if item.get('shortDescription'):
-                description = item['shortDescription']
-
-            # If a price is available, add it
-            price_info = item.get('price', {})
-            if price_info.get('currencyCode') and price_info.get('amount'):
-                 description += f" (Price: {price_info['amount']} {price_info['currencyCode']})"
-
-            activities_list.append(Activity(name, description))
-
-        if activities_list:
-            logging.info(f"[get_activities] Found {len(activities_list)} activities.")
-            return activities_list
-        
-        # Fallback if API returns nothing
-        logging.info(f"[get_activities] No dynamic activities found for {destination}, using static fallback.")
-        return [Activity("Local Exploration", "Explore nearby attractions and sights."), Activity("Dining Experience", "Try a highly-rated local restaurant.")]
-
-    except ResponseError as error:
-        logging.error(f"[get_activities] Amadeus API error: {error}")
-        # Fallback to static if API call fails
-        return [Activity("City Walking Tour", "Explore the main sights on foot (API Error Fallback)."), Activity("Local Market", "Enjoy local food and crafts (API Error Fallback).")]
-    except Exception as error:
-        logging.error(f"[get_activities] General error: {error}")
-        # General error fallback
-        return [Activity("Activity Search Failed", "Check local listings (General Error Fallback).")]
+        # Use short description if available
+        if item.get('shortDescription'):
+            description = item['shortDescription']
+
+        # If a price is available, add it
+        price_info = item.get('price', {})
+        if price_info.get('currencyCode') and price_info.get('amount'):
+             description += f" (Price: {price_info['amount']} {price_info['currencyCode']})"
+
+        activities_list.append(Activity(name, description))
+
+    if activities_list:
+        logger.info("[_search_activities] Found %d activities.", len(activities_list))
+        return activities_list
+    
+    logger.info("[_search_activities] No dynamic activities found for %s.", destination)
+    return None
+
+def gather_all(trip: UserTripRequest) -> Tuple[Optional[FlightOption], Optional[HotelOption], Optional[List[Activity]]]:
+    """Runs the flight, hotel and activity lookups concurrently and returns all three results (None if failed)."""
+    # The three lookups are independent and network-bound, so run them side by side
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        # 1. FLIGHT SEARCH: MUST use Airport Codes for both origin (trip.origin) 
+        #    and destination (trip.destination_airport).
+        f_flight = ex.submit(find_best_flight, trip.origin, trip.destination_airport, trip.departure_date, trip.return_date)
+
+        # 2. HOTEL & ACTIVITIES: MUST use the City Code (which is stored in trip.destination).
+        f_hotel = ex.submit(find_best_hotel, trip.destination, trip.departure_date, trip.return_date)
+        # Activities now fetches real-time data using coordinates derived from the City Code
+        f_acts = ex.submit(get_activities, trip.destination)
+
+        return f_flight.result(), f_hotel.result(), f_acts.result()
 
 # ---------- CLI input ----------
-def get_user_trip_from_cli() -> UserTripRequest:
-    print("=== Agentic Personal Travel Planner (CrewAI + LLM) ===")
-    origin = input("Enter origin city name (e.g., New York): ").strip().title()
-    destination = input("Enter destination city name (e.g., Paris): ").strip().title()
-    dep = input("Enter departure date (YYYY-MM-DD): ").strip()
-    ret = input("Enter return date (YYYY-MM-DD): ").strip()
+def _run_in_background(func: Callable, *args) -> Future:
+    """
+    Runs func(*args) on a daemon thread and returns a Future for its result. Unlike a
+    ThreadPoolExecutor worker, a pending lookup never delays exit on a bad date or Ctrl+C.
+    """
+    future: Future = Future()
 
-    for d in [dep, ret]:
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
         try:
-            datetime.strptime(d, "%Y-%m-%d")
-        except ValueError:
-            logging.error("Invalid date format entered.")
-            raise SystemExit("Invalid date format. Use YYYY-MM-DD.")
+            future.set_result(func(*args))
+        except BaseException as error:
+            future.set_exception(error)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+def _input_date(prompt: str) -> str:
+    """Reads one YYYY-MM-DD date, exiting straight away if it is malformed."""
+    value = input(prompt).strip()
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        logger.error("Invalid date format entered.")
+        raise SystemExit("Invalid date format. Use YYYY-MM-DD.")
+    return value
 
-    # Convert city names to IATA codes
+def get_user_trip_from_cli() -> UserTripRequest:
+    print("=== Agentic Personal Travel Planner (CrewAI + LLM) ===")
+    # Codes are resolved in the background while the user is still typing
+    origin = input("Enter origin city name (e.g., New York): ").strip().title()
     # Origin needs the specific airport code for flight search
-    origin_code = get_airport_code(origin)
+    origin_future = _run_in_background(get_airport_code, origin)
+    destination = input("Enter destination city name (e.g., Paris): ").strip().title()
     # The destination for hotels/activities needs the City Code
-    destination_city_code = get_city_code(destination)
+    dest_future = _run_in_background(get_city_code, destination)
+    # The flight search needs the destination airport; look it up by the city name,
+    # since the three-letter city code often fails as a keyword
+    dest_airport_future = _run_in_background(get_airport_code, destination)
+    dep = _input_date("Enter departure date (YYYY-MM-DD): ")
+    ret = _input_date("Enter return date (YYYY-MM-DD): ")
+
+    # Collect the IATA codes; the lookups usually finished while the dates were typed
+    origin_code = origin_future.result()
+    destination_city_code = dest_future.result()
+    destination_airport_code = dest_airport_future.result()
     
-    logging.info(f"Using origin airport: {origin_code}")
-    logging.info(f"Using destination city code for hotel/activities: {destination_city_code}")
+    logger.info("Using origin airport: %s", origin_code)
+    logger.info("Using destination city code for hotel/activities: %s", destination_city_code)
+    logger.info("Using destination airport: %s", destination_airport_code)
 
     return UserTripRequest(
         origin=origin_code,           # Airport Code (e.g., JFK)
         destination=destination_city_code, # City Code (e.g., PAR)
         departure_date=dep,
         return_date=ret,
+        destination_airport=destination_airport_code, # Airport Code (e.g., CDG)
     )
 
-# ---------- CrewAI multi-agent setup ----------
-def build_travel_planner_crew(trip: UserTripRequest) -> Crew:
-    # Agent 1: Planner
-    planner = Agent(
-        role="Travel planner",
-        goal="Understand the user's trip details and plan what information is needed.",
-        backstory=(
-            "You are a helpful travel planning assistant. "
-            "You break down the planning task into flights, hotels, and activities."
-        ),
-        verbose=True,
-    )
-
-    # Agent 2: Flight researcher
-    flight_agent = Agent(
-        role="Flight search specialist",
-        goal="Summarize the best flight option clearly.",
-        backstory=(
-            "You specialize in finding good flight deals using Amadeus API data."
-        ),
-        verbose=True,
-    )
-
-    # Agent 3: Hotel researcher
-    hotel_agent = Agent(
-        role="Hotel search specialist",
-        goal="Summarize the best hotel option clearly.",
-        backstory=(
-            "You specialize in suggesting hotels using Amadeus API data."
-        ),
-        verbose=True,
-    )
+def prewarm_amadeus_token():
+    """
+    Issues a tiny locations lookup so the SDK fetches and caches its OAuth bearer token
+    while the user is still typing at the CLI prompts.
+    """
+    try:
+        _rate_limiter.acquire()
+        amadeus.reference_data.locations.get(keyword="NYC", subType="CITY", view="LIGHT")
+    except Exception as error:
+        # Not fatal: the first real search will simply fetch the token itself
+        logger.info("[prewarm_amadeus_token] Token prewarm failed: %s", error)
 
-    # Agent 4: Itinerary writer
-    itinerary_agent = Agent(
-        role="Itinerary writer",
-        goal="Write a small, clear travel itinerary.",
-        backstory=(
-            "You turn structured information into a concise, itemized itinerary "
-            "easy to read in a terminal."
-        ),
-        verbose=True,
-    )
+# ---------- CrewAI multi-agent setup ----------
+# The agents are stateless apart from role/goal/backstory, so they are built once at import
+# and shared by every crew; only the Tasks carry per-trip data. Crews are kicked off one at a
+# time, so no locking is needed around the shared agents.
+# They also share the planner's LLM (crewai otherwise builds a separate one, with its own
+# HTTP client, for each agent), so one connection pool serves the whole crew.
+
+# Agent 1: Planner
+planner = Agent(
+    role="Travel planner",
+    goal="Understand the user's trip details and plan what information is needed.",
+    backstory=(
+        "You are a helpful travel planning assistant. "
+        "You break down the planning task into flights, hotels, and activities."
+    ),
+    verbose=True,
+)
+
+# Agent 2: Flight researcher
+flight_agent = Agent(
+    role="Flight search specialist",
+    goal="Summarize the best flight option clearly.",
+    backstory=(
+        "You specialize in finding good flight deals using Amadeus API data."
+    ),
+    verbose=True,
+    llm=planner.llm,
+)
+
+# Agent 3: Hotel researcher
+hotel_agent = Agent(
+    role="Hotel search specialist",
+    goal="Summarize the best hotel option clearly.",
+    backstory=(
+        "You specialize in suggesting hotels using Amadeus API data."
+    ),
+    verbose=True,
+    llm=planner.llm,
+)
+
+# Agent 4: Itinerary writer
+itinerary_agent = Agent(
+    role="Itinerary writer",
+    goal="Write a small, clear travel itinerary.",
+    backstory=(
+        "You turn structured information into a concise, itemized itinerary "
+        "easy to read in a terminal."
+    ),
+    verbose=True,
+    llm=planner.llm,
+)
+
+def prewarm_llm_client():
+    """
+    Opens the connection pool of the shared OpenAI client with one cheap models.list() call,
+    so kickoff reuses a warm TLS connection and a bad key shows up while the user is still typing.
+    """
+    # _get_sync_client is crewai's private accessor for the provider SDK client. The Anthropic,
+    # Gemini, Azure and Bedrock providers define it too, so only warm an actual OpenAI client.
+    get_client = getattr(getattr(planner, "llm", None), "_get_sync_client", None)
+    try:
+        client = get_client() if get_client is not None else None
+        if not isinstance(client, openai.OpenAI):
+            return
+        # with_options shares the client's HTTP pool; keep the warmup short and retry-free
+        client.with_options(timeout=5.0, max_retries=0).models.list()
+    except Exception as error:
+        # Not fatal: kickoff will surface a real key/connectivity problem itself
+        logger.info("[prewarm_llm_client] Warmup failed: %s", error)
 
+def build_travel_planner_crew(trip: UserTripRequest) -> Crew:
     # The trip object contains:
     # trip.origin: Airport Code (e.g., JFK)
     # trip.destination: City Code (e.g., PAR)
-
-    # Convert the destination City Code (trip.destination, e.g., PAR) into a 
-    # specific Airport Code (e.g., CDG or ORY) for the flight search.
-    dest_airport_code = get_airport_code(trip.destination) 
+    # trip.destination_airport: Airport Code (e.g., CDG), resolved during CLI input
 
     # Get real data from APIs
-    
-    # 1. FLIGHT SEARCH: MUST use Airport Codes for both origin (trip.origin) 
-    #    and destination (dest_airport_code).
-    flight = find_best_flight(trip.origin, dest_airport_code, trip.departure_date, trip.return_date)
-    
-    # 2. HOTEL & ACTIVITIES: MUST use the City Code (which is stored in trip.destination).
-    hotel = find_best_hotel(trip.destination, trip.departure_date, trip.return_date)
-    # Activities now fetches real-time data using coordinates derived from the City Code
-    activities = get_activities(trip.destination)
-
-    activities_text = "\n".join([f"- {a.name}: {a.description}" for a in activities])
+    flight, hotel, activities = gather_all(trip)
+
+    # Missing results (None: the lookup failed or found nothing) get no data section or specialist.
+    # Instead the prompts name them as missing, so the LLM neither invents them nor hides the gap.
+    summarized = [name for name, data in (("flight", flight), ("hotel", hotel)) if data]
+    missing = [name for name, data in (("flight", flight), ("hotel", hotel), ("activity", activities)) if not data]
+    missing_notes = "".join(
+        f"No {name} data is available (the lookup failed or found nothing): "
+        f"tell the traveller so and do not invent {name} details.\n"
+        for name in missing
+    )
+    team = [f"{name} specialist" for name in summarized] + ["itinerary writer"]
+    team_text = " and ".join([", ".join(team[:-1]), team[-1]]) if len(team) > 1 else team[0]
 
     # Tasks
     planner_task = Task(
         description=(
             f"User wants to travel from {trip.origin} to {trip.destination} "
-            f"({trip.departure_date} to {trip.return_date}). "
-            "Plan what information is needed and delegate to specialists."
+            f"({trip.departure_date} to {trip.return_date}).\n"
+            f"{missing_notes}"
+            f"Plan what the {team_text} should provide."
         ),
         agent=planner,
         expected_output="Short plan of what each specialist should provide.",
     )
+    agents = [planner]
+    tasks = [planner_task]
+    # Sections of the final itinerary, in order
+    sections = []
+
+    if flight:
+        flight_task = Task(
+            description=(
+                f"Flight data:\n"
+                f"- Airline: {flight.airline}\n"
+                f"- Price: {flight.price}\n"
+                f"- Departure: {flight.departure_time}\n"
+                f"- Arrival: {flight.arrival_time}\n\n"
+                "Summarize as 2-3 bullet points for itinerary."
+            ),
+            agent=flight_agent,
+            expected_output="2-3 bullet points describing the flight.",
+        )
+        agents.append(flight_agent)
+        tasks.append(flight_task)
+        sections.append("Flight")
+
+    if hotel:
+        hotel_task = Task(
+            description=(
+                f"Hotel data:\n"
+                f"- Name: {hotel.name}\n"
+                f"- Price: {hotel.nightly_price}\n"
+                f"- Address: {hotel.address}\n\n"
+                "Summarize as 2-3 bullet points for itinerary."
+            ),
+            agent=hotel_agent,
+            expected_output="2-3 bullet points describing the hotel.",
+        )
+        agents.append(hotel_agent)
+        tasks.append(hotel_task)
+        sections.append("Hotel")
 
-    flight_task = Task(
-        description=(
-            f"Flight data:\n"
-            f"- Airline: {flight.airline}\n"
-            f"- Price: {flight.price}\n"
-            f"- Departure: {flight.departure_time}\n"
-            f"- Arrival: {flight.arrival_time}\n\n"
-            "Summarize as 2-3 bullet points for itinerary."
-        ),
-        agent=flight_agent,
-        expected_output="2-3 bullet points describing the flight.",
-    )
+    activities_text = ""
+    if activities:
+        activities_text = "Activities:\n" + "\n".join(f"- {a.name}: {a.description}" for a in activities) + "\n\n"
+        sections.append("Activities")
+    sections.append("Simple day plan (3 lines max)")
 
-    hotel_task = Task(
-        description=(
-            f"Hotel data:\n"
-            f"- Name: {hotel.name}\n"
-            f"- Price: {hotel.nightly_price}\n"
-            f"- Address: {hotel.address}\n\n"
-            "Summarize as 2-3 bullet points for itinerary."
-        ),
-        agent=hotel_agent,
-        expected_output="2-3 bullet points describing the hotel.",
-    )
+    summaries_hint = f"Use {'/'.join(summarized)} summaries above. " if summarized else ""
 
     itinerary_task = Task(
         description=(
             # Replaced '→' with '->' here to prevent UnicodeEncodeError in verbose logging
             f"Trip: {trip.origin} -> {trip.destination} ({trip.departure_date} to {trip.return_date})\n"
-            f"Activities:\n{activities_text}\n\n"
-            "Use flight/hotel summaries above. Create SMALL itinerary:\n"
-            "1. Flight\n2. Hotel\n3. Activities\n4. Simple day plan (3 lines max)"
+            f"{activities_text}"
+            f"{missing_notes}"
+            f"{summaries_hint}Create SMALL itinerary:\n"
+            + "\n".join(f"{i}. {section}" for i, section in enumerate(sections, start=1))
         ),
         agent=itinerary_agent,
         expected_output="Compact travel itinerary.",
     )
+    agents.append(itinerary_agent)
+    tasks.append(itinerary_task)
 
     return Crew(
-        agents=[planner, flight_agent, hotel_agent, itinerary_agent],
-        tasks=[planner_task, flight_task, hotel_task, itinerary_task],
+        agents=agents,
+        tasks=tasks,
         process=Process.sequential,
         verbose=True,
     )
@@ -486,22 +783,25 @@ def main():
     setup_logging()
     
     if not os.getenv("OPENAI_API_KEY"):
-        logging.error("OPENAI_API_KEY not found. Set as system variable.")
+        logger.error("OPENAI_API_KEY not found. Set as system variable.")
         # Raise SystemExit after logging the error
         raise SystemExit("OPENAI_API_KEY not found. Set as system variable.")
 
+    # Fetch the Amadeus token in the background; it overlaps with the CLI prompts below
+    threading.Thread(target=prewarm_amadeus_token, daemon=True).start()
+    # Same for the OpenAI client the crew's agents share
+    llm_prewarm = threading.Thread(target=prewarm_llm_client, daemon=True)
+    llm_prewarm.start()
+
     trip = get_user_trip_from_cli()
     crew = build_travel_planner_crew(trip)
-    logging.info("\nRunning multi-agent crew...\n")
+    # Usually long finished; never let a stalled warmup hold up kickoff
+    llm_prewarm.join(timeout=2.0)
+    logger.info("\nRunning multi-agent crew...\n")
     result = crew.kickoff()
 
-    # 1. Log the result (captures in file with timestamp/level, and in console with formatting)
-    logging.info("\n=== Final Itinerary (LOGGED) ===")
-    logging.info(result)
-    
-    # 2. Print the result clean to the console (for better user readability, without logging prefixes)
-    print("\n\n=== Final Itinerary (PRINTED) ===")
-    print(result)
+    # Emit the result once: the file gets it with timestamp/level, the console gets it clean
+    logger.log(RESULT, "\n=== Final Itinerary ===\n%s", result)
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
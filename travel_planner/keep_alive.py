@@ -0,0 +1,103 @@
+"""
+Keep-alive HTTP transport for the Amadeus SDK (passed as amadeus.Client(http=...)).
+"""
+import http.client
+import threading
+from typing import Dict, List, Tuple
+from urllib.error import URLError
+from urllib.parse import urlsplit
+from urllib.request import build_opener, getproxies, proxy_bypass
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+class _BufferedResponse:
+    """Already-read HTTP response exposing the bits of urlopen's result the Amadeus SDK parses."""
+
+    def __init__(self, response: http.client.HTTPResponse):
+        self.status = response.status
+        self.code = response.status
+        self._headers = response.getheaders()
+        self._msg = response.msg # case-insensitive header mapping, as urlopen's info() returns
+        self._body = response.read()
+
+    def getheaders(self):
+        return self._headers
+
+    def info(self):
+        return self._msg
+
+    def read(self):
+        return self._body
+
+class KeepAliveOpener:
+    """
+    urlopen-compatible callable for amadeus.Client(http=...).
+    The default urlopen opens a new TCP+TLS connection per request; this keeps a small
+    pool of persistent connections per host so later calls skip the handshake.
+    Timeouts are per socket operation; callers should pass one comfortably above the slowest
+    search (flight searches can take ~10 s) so that a stalled connection cannot block exit forever.
+
+    Requests that need what urlopen does beyond a plain connection - a configured proxy
+    (HTTPS_PROXY / no_proxy etc.) or following a redirect - are handed to urlopen itself.
+    """
+
+    # Errors meaning a pooled connection was closed by the server while it sat idle
+    _STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+    def __init__(self, timeout: float | None = None):
+        self.timeout = timeout
+        self._idle: Dict[str, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _checkout(self, scheme: str, netloc: str, reuse: bool = True) -> Tuple[http.client.HTTPConnection, bool]:
+        """Returns (connection, reused) - an idle pooled connection if there is one, else a new one."""
+        if reuse:
+            with self._lock:
+                idle = self._idle.get(netloc)
+                if idle:
+                    return idle.pop(), True
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout), False
+        return http.client.HTTPConnection(netloc, timeout=self.timeout), False
+
+    def _checkin(self, netloc: str, conn: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.setdefault(netloc, []).append(conn)
+
+    def _urlopen(self, request):
+        # A fresh opener rather than urlopen's cached one, whose ProxyHandler keeps the
+        # proxy settings from the first call and would disagree with getproxies() above
+        opener = build_opener()
+        if self.timeout is None:
+            return opener.open(request)
+        return opener.open(request, timeout=self.timeout)
+
+    def __call__(self, request):
+        url = urlsplit(request.full_url)
+        if url.scheme in getproxies() and not proxy_bypass(url.hostname):
+            return self._urlopen(request)
+        path = f"{url.path}?{url.query}" if url.query else url.path
+        headers = dict(request.header_items())
+
+        conn, reused = self._checkout(url.scheme, url.netloc)
+        while True:
+            try:
+                conn.request(request.get_method(), path, body=request.data, headers=headers)
+                response = _BufferedResponse(conn.getresponse())
+            except self._STALE_ERRORS as error:
+                conn.close()
+                if not reused:
+                    raise URLError(error)
+                # The server dropped this idle connection before seeing the request; resend once
+                # on a brand-new connection. Timeouts and other errors are never retried.
+                conn, reused = self._checkout(url.scheme, url.netloc, reuse=False)
+                continue
+            except (OSError, http.client.HTTPException) as error:
+                conn.close()
+                # The SDK turns URLError into its NetworkError
+                raise URLError(error)
+            self._checkin(url.netloc, conn)
+            if response.status in _REDIRECT_STATUSES:
+                # Rare for the Amadeus API; let urlopen's redirect handling take it from here
+                return self._urlopen(request)
+            return response
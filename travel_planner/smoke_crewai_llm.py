@@ -1,7 +1,9 @@
 import os
-from crewai import Agent, Task, Crew
 
 def main():
+    # Imported here so merely importing this module stays cheap
+    from crewai import Agent, Task, Crew
+
     # 1) Check that the key is visible to Python
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
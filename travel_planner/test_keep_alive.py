@@ -0,0 +1,123 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+amadeus = pytest.importorskip("amadeus")
+
+from keep_alive import KeepAliveOpener
+
+
+class _AmadeusStub(BaseHTTPRequestHandler):
+    """Minimal Amadeus look-alike: token endpoint plus a few GET paths driving the tests."""
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, payload, headers=()):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        # Lowercase on purpose: the SDK must still find it (case-insensitive headers)
+        self.send_header("content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.connections.add(self.client_address)
+        self.server.paths.append(self.path)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self._send(200, {"access_token": "token", "expires_in": 1800})
+
+    def do_GET(self):
+        if "/bad" in self.path:
+            self._send(400, {"errors": [{"status": 400, "title": "INVALID FORMAT"}]})
+        elif "/moved" in self.path:
+            self._send(302, {}, headers=[("Location", "/v1/ok")])
+        else:
+            if "/last" in self.path:
+                # Drops the keep-alive socket without telling the client, like an idle timeout
+                self.close_connection = True
+            self._send(200, {"data": [{"iataCode": "PAR"}]})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _AmadeusStub)
+    srv.connections = set()
+    srv.paths = []
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_proxy_env(monkeypatch):
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY", "no_proxy", "NO_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def _client(port):
+    return amadeus.Client(
+        client_id="id", client_secret="secret",
+        host="127.0.0.1", port=port, ssl=False,
+        http=KeepAliveOpener(timeout=5.0),
+    )
+
+
+def test_reuses_one_connection(server):
+    client = _client(server.server_port)
+    for _ in range(3):
+        assert client.get("/v1/ok").data == [{"iataCode": "PAR"}]
+    # Token fetch plus three lookups over a single socket
+    assert len(server.connections) == 1
+
+
+def test_resends_once_when_idle_connection_was_dropped(server):
+    client = _client(server.server_port)
+    client.get("/v1/last")
+    assert client.get("/v1/ok").data == [{"iataCode": "PAR"}]
+    assert len(server.connections) == 2
+    assert server.paths.count("/v1/ok") == 1
+
+
+def test_client_error_passes_through(server):
+    client = _client(server.server_port)
+    with pytest.raises(amadeus.ClientError) as excinfo:
+        client.get("/v1/bad")
+    assert excinfo.value.response.status_code == 400
+    # The error response did not cost the pooled connection
+    client.get("/v1/ok")
+    assert len(server.connections) == 1
+
+
+def test_transport_error_maps_to_network_error():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    # Nothing listens on the port any more
+    with pytest.raises(amadeus.NetworkError):
+        _client(port).get("/v1/ok")
+
+
+def test_follows_redirects_via_urlopen(server):
+    client = _client(server.server_port)
+    assert client.get("/v1/moved").data == [{"iataCode": "PAR"}]
+
+
+def test_configured_proxy_is_honoured(server, monkeypatch):
+    # The stub doubles as the proxy: a proxied request carries the absolute URL as its path
+    monkeypatch.setenv("http_proxy", f"http://127.0.0.1:{server.server_port}")
+    client = amadeus.Client(
+        client_id="id", client_secret="secret",
+        host="api.example.test", port=80, ssl=False,
+        http=KeepAliveOpener(timeout=5.0),
+    )
+    assert client.get("/v1/ok").data == [{"iataCode": "PAR"}]
+    assert any(path.startswith("http://api.example.test/v1/ok") for path in server.paths)